@@ -0,0 +1,90 @@
+import re
+import time
+import json
+import hashlib
+from collections import OrderedDict
+
+# Words that carry no meaning for matching questions ("what's the date" vs "what is the date").
+# Prepositions are kept: "flights to Paris" and "flights for Paris" are different questions.
+STOP_WORDS = {
+    "a", "an", "the", "is", "are", "was", "s",
+    "me", "my", "please", "can", "you", "could", "would", "tell", "what", "whats",
+}
+
+TOKEN_RE = re.compile(r"[a-z]+|\d+")
+
+# Prompts whose answer depends on the clock ("days until Christmas", "the current date",
+# "what time is it", "what's the year?")
+TIME_RELATIVE_RE = re.compile(
+    r"\b(?:today|tonight|tomorrow|yesterday|now|current|currently|this (?:week|month|year)"
+    r"|next|last|ago|until|till|since|remaining"
+    r"|(?:time|date|day|month|year) is it)\b"
+    r"|\bthe (?:time|date|day|month|year)\W*$",
+    re.IGNORECASE,
+)
+
+def prompt_fingerprint(system_prompt: str, tools) -> str:
+    """Hash the system prompt and tool schemas so cached answers expire when either changes."""
+    payload = json.dumps([system_prompt, tools], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def normalize(text: str) -> tuple:
+    """Return the content words and numbers of the text, lowercased, in the order they appear."""
+    return tuple(token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS)
+
+class ResponseCache:
+    """
+    In-process cache of Claude responses, keyed by normalized prompt text.
+
+    A lookup hits when an unexpired entry with the same prompt fingerprint has
+    the same content words and numbers, in the same order, as the new prompt.
+    Only rephrasings that differ in stop words ("what's the date" vs "what is
+    the date"), case or punctuation share an answer, so "2025-07-04" and
+    "2025-04-07" never do, and neither do "is A before B" and "is B before A".
+    """
+
+    def __init__(self, ttl: float = 3600.0, min_words: int = 2,
+                 uncacheable_re=TIME_RELATIVE_RE, max_entries: int = 256):
+        self.ttl = ttl
+        # Least recently used entries are evicted once this many are cached
+        self.max_entries = max_entries
+        # Very short prompts ("yes", "why?") depend on context, so they are never cached
+        self.min_words = min_words
+        # Prompts matching this pattern are never cached; None caches everything
+        self.uncacheable_re = uncacheable_re
+        # Maps (fingerprint, normalized words) to (response_text, expires_at)
+        self.entries = OrderedDict()
+
+    def cache_key(self, prompt: str, fingerprint: str):
+        """Return the entry key for the prompt, or None if it must not be cached."""
+        if self.uncacheable_re is not None and self.uncacheable_re.search(prompt):
+            return None
+        words = normalize(prompt)
+        if len(words) < self.min_words:
+            return None
+        return fingerprint, words
+
+    def lookup(self, prompt: str, fingerprint: str):
+        """Return the cached response text for the prompt, or None."""
+        key = self.cache_key(prompt, fingerprint)
+        entry = self.entries.get(key) if key is not None else None
+        if entry is None:
+            return None
+
+        response_text, expires_at = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return response_text
+
+    def store(self, prompt: str, fingerprint: str, response_text: str):
+        """Cache a response for the given prompt."""
+        key = self.cache_key(prompt, fingerprint)
+        if key is None:
+            return
+
+        self.entries[key] = (response_text, time.time() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
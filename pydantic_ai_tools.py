@@ -1,9 +1,12 @@
 import os
 import re
+import sys
 import json
+from functools import cache, lru_cache
 from colorama import Fore, Style, init
 from pydantic_ai import Agent
-from datetime import datetime, timedelta
+from datetime import date
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -15,21 +18,26 @@ init()
 # Read the API key
 anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
 
+# Colored "Name: " prefixes for each speaker, built once at import
+AGENT_PREFIX = {
+    "Assistant": Fore.CYAN + "Assistant: ",
+    "User": Fore.GREEN + "User: ",
+    "System": Fore.YELLOW + "System: ",
+}
+LINE_END = Style.RESET_ALL + "\n"
+
+def agent_prefix(agent_name):
+    """Return the colored prefix for the agent/speaker."""
+    prefix = AGENT_PREFIX.get(agent_name)
+    if prefix is None:
+        prefix = Fore.WHITE + f"{agent_name}: "
+    return prefix
+
 def print_colored(agent_name, text):
     """Print colored text based on the agent/speaker."""
-    agent_colors = {
-        "Assistant": Fore.CYAN,
-        "User": Fore.GREEN,
-        "System": Fore.YELLOW,
-    }
-    color = agent_colors.get(agent_name, Fore.WHITE)
-    print(color + f"{agent_name}: {text}" + Style.RESET_ALL)
-
-# Create agent with tools
-# agent = Agent("anthropic:claude-3-5-sonnet-latest")
-agent = Agent(
-    "anthropic:claude-3-5-sonnet-latest",
-    system_prompt="""You are a helpful AI assistant with access to date-related tools. 
+    sys.stdout.write(f"{agent_prefix(agent_name)}{text}{LINE_END}")
+
+SYSTEM_PROMPT = """You are a helpful AI assistant with access to date-related tools. 
     
     You should:
     - Answer general questions normally and conversationally
@@ -37,9 +45,71 @@ agent = Agent(
     - Be friendly and helpful with all types of questions
     
     The tools available to you are for date calculations, but you can discuss any topic the user wants to talk about."""
-)
 
-@agent.tool_plain
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Matches the shapes strptime('%Y-%m-%d') accepted, including single-digit month/day
+DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
+INVALID_DATE_MESSAGE = "Invalid date format. Please use YYYY-MM-DD format."
+OUT_OF_RANGE_MESSAGE = "Date out of range: the week runs past 9999-12-31."
+# Ordinal of 9999-12-31, the last date that date can represent
+LAST_ORDINAL = date.max.toordinal()
+
+def parse_date(date_str: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD string, returning None if it is not a valid date."""
+    match = DATE_RE.fullmatch(date_str)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    try:
+        # Well-formed strings can still name impossible dates, such as 2025-02-30
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+def weekday_from_ordinal(ordinal: int) -> int:
+    """Return the weekday (Monday is 0) of the date with the given ordinal."""
+    # Ordinal 1 (0001-01-01) is a Monday, so a single modulo gives the weekday
+    return (ordinal - 1) % 7
+
+def monday_ordinal(ordinal: int) -> int:
+    """Return the ordinal of the Monday on or before the date with the given ordinal."""
+    return ordinal - weekday_from_ordinal(ordinal)
+
+# Cached implementations of the pure date tools. Each result depends only on
+# the date string, so repeated tool calls with the same date are a lookup.
+@lru_cache(maxsize=512)
+def _monday_cached(date_str: str) -> str:
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return INVALID_DATE_MESSAGE
+    return date.fromordinal(monday_ordinal(parsed.toordinal())).isoformat()
+
+@lru_cache(maxsize=512)
+def _week_info_cached(date_str: str) -> str:
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return INVALID_DATE_MESSAGE
+    monday_ord = monday_ordinal(parsed.toordinal())
+    if monday_ord + 6 > LAST_ORDINAL:
+        return OUT_OF_RANGE_MESSAGE
+    
+    # The output always has seven lines, so fill a fixed template
+    d0, d1, d2, d3, d4, d5, d6 = map(date.isoformat, map(date.fromordinal, range(monday_ord, monday_ord + 7)))
+    return (
+        f"Week containing {date_str}:\n"
+        f"Monday: {d0}\nTuesday: {d1}\nWednesday: {d2}\nThursday: {d3}\n"
+        f"Friday: {d4}\nSaturday: {d5}\nSunday: {d6}"
+    )
+
+@lru_cache(maxsize=512)
+def _day_of_week_cached(date_str: str) -> str:
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return INVALID_DATE_MESSAGE
+    return f"{date_str} is a {DAY_NAMES[weekday_from_ordinal(parsed.toordinal())]}"
+
 def get_monday(date_str: str) -> str:
     """
     Returns the date of the Monday of the week containing the given date.
@@ -50,45 +120,66 @@ def get_monday(date_str: str) -> str:
     Returns:
         str: The date of the Monday of that week in YYYY-MM-DD format
     """
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        monday = date - timedelta(days=date.weekday())
-        return monday.strftime('%Y-%m-%d')
-    except ValueError:
-        return "Invalid date format. Please use YYYY-MM-DD format."
+    return _monday_cached(date_str)
 
-@agent.tool_plain
 def get_current_date() -> str:
     """Get the current date in YYYY-MM-DD format."""
-    return datetime.now().strftime('%Y-%m-%d')
+    return date.today().isoformat()
 
-@agent.tool_plain
 def get_week_info(date_str: str) -> str:
     """Get comprehensive week information for a given date including all days of the week."""
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        monday = date - timedelta(days=date.weekday())
-        
-        week_days = []
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
-        for i in range(7):
-            day = monday + timedelta(days=i)
-            week_days.append(f"{day_names[i]}: {day.strftime('%Y-%m-%d')}")
-        
-        return f"Week containing {date_str}:\n" + "\n".join(week_days)
-    except ValueError:
-        return "Invalid date format. Please use YYYY-MM-DD format."
+    return _week_info_cached(date_str)
 
-@agent.tool_plain
 def get_day_of_week(date_str: str) -> str:
     """Get the day of the week for a given date."""
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        return f"{date_str} is a {day_names[date.weekday()]}"
-    except ValueError:
-        return "Invalid date format. Please use YYYY-MM-DD format."
+    return _day_of_week_cached(date_str)
+
+def describe_monday(date_str: str) -> str:
+    """Phrase get_monday's result as a sentence, passing error messages through."""
+    monday = get_monday(date_str)
+    if monday == INVALID_DATE_MESSAGE:
+        return monday
+    return f"The Monday of the week containing {date_str} is {monday}."
+
+# Questions simple enough to answer with a direct tool call, skipping Claude.
+# Patterns must match the whole input so compound questions still go to Claude.
+FAST_PATHS = (
+    (
+        re.compile(r"what(?:['’]?s| is) today['’]?s date\??", re.IGNORECASE),
+        "get_current_date",
+        lambda m: f"Today's date is {get_current_date()}.",
+    ),
+    (
+        re.compile(r"what day(?: of the week)? is (\d{4}-\d{1,2}-\d{1,2})\??", re.IGNORECASE),
+        "get_day_of_week",
+        lambda m: get_day_of_week(m.group(1)),
+    ),
+    (
+        re.compile(r"what(?: date)? is (?:the )?monday of the week (?:containing|of|for) (\d{4}-\d{1,2}-\d{1,2})\??", re.IGNORECASE),
+        "get_monday",
+        lambda m: describe_monday(m.group(1)),
+    ),
+)
+
+def answer_locally(user_input: str):
+    """Return (response_text, tool_name) if a fast path answers the input, else None."""
+    for pattern, tool_name, answer in FAST_PATHS:
+        match = pattern.fullmatch(user_input)
+        if match:
+            return answer(match), tool_name
+    return None
+
+@cache
+def build_agent() -> Agent:
+    """Create the agent and register the date tools, once per process."""
+    # agent = Agent("anthropic:claude-3-5-sonnet-latest")
+    agent = Agent(
+        "anthropic:claude-3-5-sonnet-latest",
+        system_prompt=SYSTEM_PROMPT
+    )
+    for tool in (get_monday, get_current_date, get_week_info, get_day_of_week):
+        agent.tool_plain(tool)
+    return agent
 
 def show_welcome():
     """Display welcome message and instructions."""
@@ -117,6 +208,7 @@ def show_help():
 
 def main():
     """Main chat loop."""
+    agent = build_agent()
     show_welcome()
     
     while True:
@@ -144,6 +236,14 @@ def main():
             if not user_input:
                 continue
             
+            # Answer simple date questions directly, without calling the agent
+            local_answer = answer_locally(user_input)
+            if local_answer is not None:
+                response_text, tool_name = local_answer
+                print_colored("Assistant", response_text)
+                print_colored("System", f"🔧 Used tools: {tool_name}")
+                continue
+            
             # Process the user's question with the agent
             print_colored("System", "🤔 Thinking...")
             
@@ -1,9 +1,15 @@
 import os
+import re
+import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style, init
-from datetime import datetime, timedelta
+from datetime import date
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 import anthropic
+from llm_cache import ResponseCache, prompt_fingerprint
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,21 +20,59 @@ init()
 # Read the API key
 anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
 
+# Colored "Name: " prefixes for each speaker, built once at import
+AGENT_PREFIX = {
+    "Assistant": Fore.CYAN + "Assistant: ",
+    "User": Fore.GREEN + "User: ",
+    "System": Fore.YELLOW + "System: ",
+}
+LINE_END = Style.RESET_ALL + "\n"
+
+def agent_prefix(agent_name):
+    """Return the colored prefix for the agent/speaker."""
+    prefix = AGENT_PREFIX.get(agent_name)
+    if prefix is None:
+        prefix = Fore.WHITE + f"{agent_name}: "
+    return prefix
+
 def print_colored(agent_name, text):
     """Print colored text based on the agent/speaker."""
-    agent_colors = {
-        "Assistant": Fore.CYAN,
-        "User": Fore.GREEN,
-        "System": Fore.YELLOW,
-    }
-    color = agent_colors.get(agent_name, Fore.WHITE)
-    print(color + f"{agent_name}: {text}" + Style.RESET_ALL)
-
-# Initialize Claude client
-client = anthropic.Anthropic(api_key=anthropic_api_key)
-
-# Define the tools that Claude can use
-tools = [
+    sys.stdout.write(f"{agent_prefix(agent_name)}{text}{LINE_END}")
+
+class StreamPrinter:
+    """Print text as it streams in, formatted like print_colored."""
+
+    def __init__(self, agent_name):
+        self.agent_name = agent_name
+        self.text = ""
+
+    def write(self, text):
+        """Print one chunk of text, starting the colored line on the first chunk."""
+        if not text:
+            return
+        if not self.text:
+            sys.stdout.write(agent_prefix(self.agent_name))
+        self.text += text
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def finish(self):
+        """End the line if anything was printed."""
+        if self.text:
+            sys.stdout.write(LINE_END)
+            sys.stdout.flush()
+
+# Initialize Claude client. One client is reused for the whole session; its
+# pooled HTTP/2 connection carries every request without a new TLS handshake.
+client = anthropic.Anthropic(
+    api_key=anthropic_api_key,
+    http_client=anthropic.DefaultHttpxClient(http2=True)
+)
+
+# Define the tools that Claude can use. The schemas are built once at import and
+# the same tuple is sent with every request. Only the tuple itself is immutable;
+# the dicts inside it are not copied, so do not modify them.
+TOOLS = (
     {
         "name": "get_monday",
         "description": "Returns the date of the Monday of the week containing the given date.",
@@ -78,11 +122,65 @@ tools = [
                 }
             },
             "required": ["date_str"]
-        }
-    }
+        },
+        # Marks the end of the cacheable prefix (tools are sent before the system prompt)
+        "cache_control": {"type": "ephemeral"}
+    },
+)
+
+SYSTEM_PROMPT = """You are a helpful AI assistant with access to date-related tools. 
+            
+            You should:
+            - Answer general questions normally and conversationally
+            - Use the available date tools when users ask about dates, weekdays, or week information
+            - Be friendly and helpful with all types of questions
+            
+            The tools available to you are for date calculations, but you can discuss any topic the user wants to talk about."""
+
+# The system prompt is sent as a cached block so every turn reuses the prefix
+system_blocks = [
+    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
 ]
 
-# Tool implementation functions
+# Cache of recent answers, reused when the user repeats or rephrases a question.
+# The fingerprint ties entries to the current system prompt and tool schemas.
+response_cache = ResponseCache()
+PROMPT_FINGERPRINT = prompt_fingerprint(SYSTEM_PROMPT, TOOLS)
+
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Matches the shapes strptime('%Y-%m-%d') accepted, including single-digit month/day
+DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
+INVALID_DATE_MESSAGE = "Invalid date format. Please use YYYY-MM-DD format."
+OUT_OF_RANGE_MESSAGE = "Date out of range: the week runs past 9999-12-31."
+# Ordinal of 9999-12-31, the last date that date can represent
+LAST_ORDINAL = date.max.toordinal()
+
+def parse_date(date_str: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD string, returning None if it is not a valid date."""
+    match = DATE_RE.fullmatch(date_str)
+    if not match:
+        return None
+    year, month, day = match.groups()
+    try:
+        # Well-formed strings can still name impossible dates, such as 2025-02-30
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+def weekday_from_ordinal(ordinal: int) -> int:
+    """Return the weekday (Monday is 0) of the date with the given ordinal."""
+    # Ordinal 1 (0001-01-01) is a Monday, so a single modulo gives the weekday
+    return (ordinal - 1) % 7
+
+def monday_ordinal(ordinal: int) -> int:
+    """Return the ordinal of the Monday on or before the date with the given ordinal."""
+    return ordinal - weekday_from_ordinal(ordinal)
+
+# Tool implementation functions. The date tools are pure, so each keeps an
+# LRU cache of results and a repeated call with the same date is a lookup.
+@lru_cache(maxsize=512)
 def get_monday(date_str: str) -> str:
     """
     Returns the date of the Monday of the week containing the given date.
@@ -93,42 +191,75 @@ def get_monday(date_str: str) -> str:
     Returns:
         str: The date of the Monday of that week in YYYY-MM-DD format
     """
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        monday = date - timedelta(days=date.weekday())
-        return monday.strftime('%Y-%m-%d')
-    except ValueError:
-        return "Invalid date format. Please use YYYY-MM-DD format."
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return INVALID_DATE_MESSAGE
+    return date.fromordinal(monday_ordinal(parsed.toordinal())).isoformat()
 
 def get_current_date() -> str:
     """Get the current date in YYYY-MM-DD format."""
-    return datetime.now().strftime('%Y-%m-%d')
+    return date.today().isoformat()
 
+@lru_cache(maxsize=512)
 def get_week_info(date_str: str) -> str:
     """Get comprehensive week information for a given date including all days of the week."""
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        monday = date - timedelta(days=date.weekday())
-        
-        week_days = []
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
-        for i in range(7):
-            day = monday + timedelta(days=i)
-            week_days.append(f"{day_names[i]}: {day.strftime('%Y-%m-%d')}")
-        
-        return f"Week containing {date_str}:\n" + "\n".join(week_days)
-    except ValueError:
-        return "Invalid date format. Please use YYYY-MM-DD format."
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return INVALID_DATE_MESSAGE
+    monday_ord = monday_ordinal(parsed.toordinal())
+    if monday_ord + 6 > LAST_ORDINAL:
+        return OUT_OF_RANGE_MESSAGE
+    
+    # The output always has seven lines, so fill a fixed template
+    d0, d1, d2, d3, d4, d5, d6 = map(date.isoformat, map(date.fromordinal, range(monday_ord, monday_ord + 7)))
+    return (
+        f"Week containing {date_str}:\n"
+        f"Monday: {d0}\nTuesday: {d1}\nWednesday: {d2}\nThursday: {d3}\n"
+        f"Friday: {d4}\nSaturday: {d5}\nSunday: {d6}"
+    )
 
+@lru_cache(maxsize=512)
 def get_day_of_week(date_str: str) -> str:
     """Get the day of the week for a given date."""
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        return f"{date_str} is a {day_names[date.weekday()]}"
-    except ValueError:
-        return "Invalid date format. Please use YYYY-MM-DD format."
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return INVALID_DATE_MESSAGE
+    return f"{date_str} is a {DAY_NAMES[weekday_from_ordinal(parsed.toordinal())]}"
+
+def describe_monday(date_str: str) -> str:
+    """Phrase get_monday's result as a sentence, passing error messages through."""
+    monday = get_monday(date_str)
+    if monday == INVALID_DATE_MESSAGE:
+        return monday
+    return f"The Monday of the week containing {date_str} is {monday}."
+
+# Questions simple enough to answer with a direct tool call, skipping Claude.
+# Patterns must match the whole input so compound questions still go to Claude.
+FAST_PATHS = (
+    (
+        re.compile(r"what(?:['’]?s| is) today['’]?s date\??", re.IGNORECASE),
+        "get_current_date",
+        lambda m: f"Today's date is {get_current_date()}.",
+    ),
+    (
+        re.compile(r"what day(?: of the week)? is (\d{4}-\d{1,2}-\d{1,2})\??", re.IGNORECASE),
+        "get_day_of_week",
+        lambda m: get_day_of_week(m.group(1)),
+    ),
+    (
+        re.compile(r"what(?: date)? is (?:the )?monday of the week (?:containing|of|for) (\d{4}-\d{1,2}-\d{1,2})\??", re.IGNORECASE),
+        "get_monday",
+        lambda m: describe_monday(m.group(1)),
+    ),
+)
+
+def answer_locally(user_input: str):
+    """Return (response_text, tool_name) if a fast path answers the input, else None."""
+    for pattern, tool_name, answer in FAST_PATHS:
+        match = pattern.fullmatch(user_input)
+        if match:
+            return answer(match), tool_name
+    return None
 
 # Tool dispatcher - maps tool names to functions
 tool_functions = {
@@ -138,6 +269,14 @@ tool_functions = {
     "get_day_of_week": get_day_of_week
 }
 
+# Tools whose result depends only on their input, so an answer built from them
+# is safe to reuse. get_current_date is excluded because its answer changes at midnight.
+cacheable_tools = {"get_monday", "get_week_info", "get_day_of_week"}
+
+def tool_cache_key(tool_name: str, tool_input: dict) -> tuple:
+    """Build a hashable key for a tool call; canonical JSON handles nested inputs."""
+    return (tool_name, json.dumps(tool_input, sort_keys=True, separators=(",", ":")))
+
 def execute_tool(tool_name: str, tool_input: dict) -> str:
     """Execute a tool function and return the result."""
     if tool_name not in tool_functions:
@@ -154,9 +293,40 @@ def execute_tool(tool_name: str, tool_input: dict) -> str:
     except Exception as e:
         return f"Error executing {tool_name}: {str(e)}"
 
-def chat_with_claude(user_message: str, conversation_history: list) -> tuple:
+# Shared worker pool for running a response's tool calls concurrently
+tool_executor = ThreadPoolExecutor(max_workers=8)
+
+# Upper bound on tool-call round trips within a single user turn
+MAX_TOOL_ROUNDS = 5
+
+# Number of most recent messages resent to Claude each turn
+MAX_HISTORY_MESSAGES = 16
+
+def trim_history(conversation_history: list, max_messages: int = MAX_HISTORY_MESSAGES) -> list:
+    """
+    Drop the oldest messages so at most max_messages remain.
+    The kept window always starts at a user's text message, so a tool_use
+    block is never separated from its tool_result. If the latest turn alone
+    is longer than the window, that whole turn is kept.
+    """
+    if len(conversation_history) <= max_messages:
+        return conversation_history
+    
+    turn_starts = [
+        i for i, message in enumerate(conversation_history)
+        if message["role"] == "user" and isinstance(message["content"], str)
+    ]
+    if not turn_starts:
+        return conversation_history
+    
+    cut = len(conversation_history) - max_messages
+    start = next((i for i in turn_starts if i >= cut), turn_starts[-1])
+    return conversation_history[start:]
+
+def chat_with_claude(user_message: str, conversation_history: list, on_text=None) -> tuple:
     """
     Send a message to Claude and handle any tool calls.
+    Text is passed to on_text as it streams in, if given.
     Returns (response_text, tools_used, updated_conversation_history)
     """
     # Add user message to conversation
@@ -164,75 +334,88 @@ def chat_with_claude(user_message: str, conversation_history: list) -> tuple:
     
     tools_used = []
     
+    # Only the first question of a conversation is cached: later questions
+    # ("show me the week for it") depend on what came before. Opening answers
+    # don't, so they stay valid across /clear and are reused when a new
+    # conversation opens with the same question.
+    use_cache = not conversation_history
+    
+    # Answer from the cache if this question was asked recently
+    cached_text = response_cache.lookup(user_message, PROMPT_FINGERPRINT) if use_cache else None
+    if cached_text is not None:
+        # No tools ran for a cached answer, so none are reported
+        messages.append({"role": "assistant", "content": cached_text})
+        return cached_text, [], messages
+    
     try:
-        # Make initial request to Claude
-        response = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=messages,
-            tools=tools,
-            system="""You are a helpful AI assistant with access to date-related tools. 
+        # Keep answering tool calls until Claude replies with text. The same tools
+        # and system blocks are sent every round so the cached prefix still matches.
+        response_text = ""
+        tool_rounds = 0
+        # Results of the tool calls made so far this turn, so identical calls run once
+        turn_results = {}
+        while True:
+            round_start = len(response_text)
+            with client.messages.stream(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                messages=messages,
+                tools=TOOLS,
+                system=system_blocks
+            ) as stream:
+                for text in stream.text_stream:
+                    if text and round_start and len(response_text) == round_start:
+                        # Separate this round's text from text before the tool call
+                        text = "\n\n" + text
+                    response_text += text
+                    if on_text:
+                        on_text(text)
+                response = stream.get_final_message()
             
-            You should:
-            - Answer general questions normally and conversationally
-            - Use the available date tools when users ask about dates, weekdays, or week information
-            - Be friendly and helpful with all types of questions
+            # Add Claude's response to conversation
+            messages.append({"role": "assistant", "content": response.content})
             
-            The tools available to you are for date calculations, but you can discuss any topic the user wants to talk about."""
-        )
-        
-        # Add Claude's response to conversation
-        messages.append({"role": "assistant", "content": response.content})
-        
-        # Check if Claude wants to use tools
-        if response.stop_reason == "tool_use":
-            # Process tool calls
-            tool_results = []
+            # Check if Claude wants to use tools
+            if response.stop_reason != "tool_use":
+                break
+            if tool_rounds == MAX_TOOL_ROUNDS:
+                # Claude never produced a final answer; drop the unfinished turn from history
+                return f"Stopped after {MAX_TOOL_ROUNDS} rounds of tool calls.", tools_used, conversation_history
+            tool_rounds += 1
             
+            # Collect this round's tool calls
+            tool_calls = []
             for content_block in response.content:
                 if content_block.type == "tool_use":
                     tool_name = content_block.name
                     tool_input = content_block.input
-                    tool_id = content_block.id
-                    
                     tools_used.append(tool_name)
-                    
-                    # Execute the tool
-                    tool_result = execute_tool(tool_name, tool_input)
-                    
-                    tool_results.append({
-                        "tool_use_id": tool_id,
-                        "type": "tool_result",
-                        "content": tool_result
-                    })
-            
-            # Send tool results back to Claude
-            messages.append({"role": "user", "content": tool_results})
-            
-            # Get Claude's final response
-            final_response = client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1000,
-                messages=messages,
-                tools=tools
-            )
+                    tool_calls.append((content_block.id, tool_cache_key(tool_name, tool_input), tool_name, tool_input))
             
-            # Extract text response
-            response_text = ""
-            for content_block in final_response.content:
-                if content_block.type == "text":
-                    response_text += content_block.text
+            # Execute the tools in parallel, skipping calls already made this turn
+            pending = {}
+            for tool_id, call_key, tool_name, tool_input in tool_calls:
+                if call_key not in turn_results and call_key not in pending:
+                    pending[call_key] = tool_executor.submit(execute_tool, tool_name, tool_input)
+            for call_key, future in pending.items():
+                turn_results[call_key] = future.result()
             
-            # Add final response to conversation
-            messages.append({"role": "assistant", "content": final_response.content})
+            # Results go back in the same order as Claude's tool_use blocks
+            tool_results = [
+                {
+                    "tool_use_id": tool_id,
+                    "type": "tool_result",
+                    "content": turn_results[call_key]
+                }
+                for tool_id, call_key, tool_name, tool_input in tool_calls
+            ]
             
-        else:
-            # No tools used, just get the text response
-            response_text = ""
-            for content_block in response.content:
-                if content_block.type == "text":
-                    response_text += content_block.text
+            # Send tool results back to Claude
+            messages.append({"role": "user", "content": tool_results})
         
+        # Answers built from get_current_date (or any other impure tool) go stale at midnight
+        if use_cache and all(tool_name in cacheable_tools for tool_name in tools_used):
+            response_cache.store(user_message, PROMPT_FINGERPRINT, response_text)
         return response_text, tools_used, messages
         
     except Exception as e:
@@ -295,13 +478,38 @@ def main():
             if not user_input:
                 continue
             
+            # Answer simple date questions directly, without calling Claude
+            local_answer = answer_locally(user_input)
+            if local_answer is not None:
+                response_text, tool_name = local_answer
+                print_colored("Assistant", response_text)
+                print_colored("System", f"🔧 Used tools: {tool_name}")
+                # Keep the exchange in history so Claude can refer back to it
+                conversation_history = conversation_history + [
+                    {"role": "user", "content": user_input},
+                    {"role": "assistant", "content": response_text},
+                ]
+                continue
+            
+            # Keep the resent history bounded in long sessions
+            trimmed_history = trim_history(conversation_history)
+            if len(trimmed_history) < len(conversation_history):
+                print_colored("System", f"✂️ Dropped {len(conversation_history) - len(trimmed_history)} older messages from history")
+                conversation_history = trimmed_history
+            
             # Process the user's question with Claude
             print_colored("System", "🤔 Thinking...")
             
-            response_text, tools_used, conversation_history = chat_with_claude(user_input, conversation_history)
+            # Display Claude's response as it streams in
+            printer = StreamPrinter("Assistant")
+            response_text, tools_used, conversation_history = chat_with_claude(
+                user_input, conversation_history, on_text=printer.write
+            )
+            printer.finish()
             
-            # Display Claude's response
-            print_colored("Assistant", response_text)
+            # Cached answers and errors are not streamed, so print them here
+            if response_text != printer.text:
+                print_colored("Assistant", response_text)
             
             # Show which tools were used
             if tools_used: